@@ -1,11 +1,20 @@
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from .utils.log import configure_logging
+
+_TREE_HASH_PATH = Path(".symphcord_tree_hash")
+
 
 class SymphCordBot(commands.Bot):
     """Discord bot that turns channel history into a short composition."""
@@ -21,6 +30,21 @@ class SymphCordBot(commands.Bot):
         self.start_time = discord.utils.utcnow()
         self._sync_guild: Optional[int] = self._load_sync_guild()
         self._log = logging.getLogger("symphcord.bot")
+        self.render_pool = self._new_render_pool()
+
+    @staticmethod
+    def _new_render_pool() -> ProcessPoolExecutor:
+        # synthesis is CPU bound; renders are already serialised by the composer queue.
+        # spawned workers start with bare logging, so give them the bot's level and format
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_logging,
+        )
+
+    def reset_render_pool(self) -> None:
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
+        self.render_pool = self._new_render_pool()
 
     @staticmethod
     def _load_application_id() -> Optional[int]:
@@ -32,13 +56,52 @@ class SymphCordBot(commands.Bot):
         raw_guild = os.getenv("DISCORD_SYNC_GUILD_ID")
         return int(raw_guild) if raw_guild else None
 
+    def _command_payload(self, command: Any) -> Dict[str, Any]:
+        try:
+            return command.to_dict(self.tree)
+        except TypeError:  # discord.py <2.4
+            return command.to_dict()
+
+    def _command_tree_hash(self, guild: Optional[discord.abc.Snowflake]) -> str:
+        payload = {
+            "application": self.application_id,
+            "guild": self._sync_guild,
+            "commands": [self._command_payload(command) for command in self.tree.get_commands(guild=guild)],
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _read_tree_hash(self) -> Optional[str]:
+        try:
+            return _TREE_HASH_PATH.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+    def _write_tree_hash(self, tree_hash: str) -> None:
+        try:
+            _TREE_HASH_PATH.write_text(tree_hash, encoding="utf-8")
+        except OSError as exc:
+            self._log.warning("Could not persist command tree hash (%s); next start will sync again.", exc)
+
+    async def close(self) -> None:
+        await super().close()
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
+
     async def setup_hook(self) -> None:
         await self.load_extension("bot.cogs.composer")
-        if self._sync_guild:
-            guild = discord.Object(id=self._sync_guild)
-            self._log.info("Syncing commands to guild %s", self._sync_guild)
+        guild = discord.Object(id=self._sync_guild) if self._sync_guild else None
+        if guild:
             self.tree.copy_global_to(guild=guild)
+
+        tree_hash = self._command_tree_hash(guild)
+        if tree_hash == self._read_tree_hash():
+            self._log.info("Command tree unchanged since last sync; skipping.")
+            return
+
+        if guild:
+            self._log.info("Syncing commands to guild %s", self._sync_guild)
             await self.tree.sync(guild=guild)
         else:
             self._log.info("Syncing commands globally (can take up to an hour).")
             await self.tree.sync()
+        self._write_tree_hash(tree_hash)
@@ -1,17 +1,19 @@
 import asyncio
+import io
 import logging
 import os
 import random
 from collections import deque
-from typing import Deque, List
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, List, Tuple
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from bot.music.note_mapper import notes_from_messages
+from bot.music.note_mapper import is_playable_message, notes_from_messages, warm_up_note_kernel
 from bot.music.synthesis import render_notes_to_wav
-from bot.music.types import NoteEvent
+from bot.music.types import NoteTrack
 
 
 class Composer(commands.Cog):
@@ -23,6 +25,10 @@ class Composer(commands.Cog):
         self._queue: Deque[int] = deque()
         self._queue_condition = asyncio.Condition()
 
+    async def cog_load(self) -> None:
+        # JIT compilation takes about a second on a fresh deploy; keep it off the event loop
+        await asyncio.to_thread(warm_up_note_kernel)
+
     @app_commands.command(name="chat-to-music", description="Turn the last 100 messages into music.")
     async def chat_to_music(self, interaction: discord.Interaction) -> None:
         if not interaction.channel:
@@ -52,13 +58,8 @@ class Composer(commands.Cog):
                 return
 
             try:
-                buffer, duration = await asyncio.to_thread(
-                    render_notes_to_wav,
-                    events,
-                    20.0,
-                    35.0,
-                )
-            except Exception as exc:  # pydub can raise many things, keep message friendly
+                buffer, duration = await self._render(events)
+            except Exception as exc:  # synthesis can raise many things, keep message friendly
                 self.log.exception("Failed to render composition")
                 await interaction.followup.send(f"I hit a snag bouncing that track ({exc}).", ephemeral=True)
                 return
@@ -72,7 +73,7 @@ class Composer(commands.Cog):
             )
             embed.add_field(name="Notes", value=str(len(events)))
             embed.add_field(name="Length", value=f"{duration:.1f} seconds")
-            embed.set_footer(text="Rendered with PyDub synths.")
+            embed.set_footer(text="Rendered with NumPy wavetable synths.")
 
             if status_message:
                 try:
@@ -131,7 +132,7 @@ class Composer(commands.Cog):
         )
         embed.add_field(
             name="Tech Stack",
-            value="discord.py · PyDub · PrettyMIDI · SoundFont rendering",
+            value="discord.py · NumPy · PrettyMIDI · SoundFont rendering",
             inline=False,
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -174,14 +175,27 @@ class Composer(commands.Cog):
         embed.set_footer(text="Thanks for making SymphCord part of your server.")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    async def _render(self, events: NoteTrack) -> Tuple[io.BytesIO, float]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.bot.render_pool, render_notes_to_wav, events, 20.0, 35.0)
+        except BrokenProcessPool:
+            # the worker died (OOM, crash in fluidsynth); start a fresh one and retry once
+            self.log.warning("Render worker died; restarting it and retrying.")
+            self.bot.reset_render_pool()
+            return await loop.run_in_executor(self.bot.render_pool, render_notes_to_wav, events, 20.0, 35.0)
+
     async def _fetch_history(self, channel: discord.abc.Messageable) -> List[discord.Message]:
-        messages: List[discord.Message] = []
         if not isinstance(channel, (discord.TextChannel, discord.Thread, discord.DMChannel)):
-            return messages
+            return []
 
-        async for message in channel.history(limit=100, oldest_first=True):
-            messages.append(message)
-        return messages
+        # oldest_first hands notes_from_messages an already chronological list;
+        # unplayable messages are dropped while streaming so they are never kept around
+        return [
+            message
+            async for message in channel.history(limit=100, oldest_first=True)
+            if is_playable_message(message)
+        ]
 
     async def _enter_queue(self, ticket: int) -> int:
         async with self._queue_condition:
@@ -202,10 +216,3 @@ class Composer(commands.Cog):
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(Composer(bot))
-
-
-# meow meow meow meow meow
-# meow meow meow meow meow
-# meow meow meow meow meow
-# meow meow meow meow meow
-# meow meow meow meow meow
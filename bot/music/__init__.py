@@ -2,6 +2,6 @@
 
 from .note_mapper import notes_from_messages
 from .synthesis import render_notes_to_wav
-from .types import InstrumentWave, NoteEvent
+from .types import InstrumentWave, NoteEvent, NoteTrack
 
-__all__ = ["InstrumentWave", "NoteEvent", "notes_from_messages", "render_notes_to_wav"]
+__all__ = ["InstrumentWave", "NoteEvent", "NoteTrack", "notes_from_messages", "render_notes_to_wav"]
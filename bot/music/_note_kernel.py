@@ -0,0 +1,89 @@
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _smooth_pitch_index(base_idx: int, previous_idx: int, total_notes: int) -> int:
+    if previous_idx < 0:
+        return base_idx
+
+    closest = base_idx
+    for candidate in (base_idx + total_notes, base_idx - total_notes):
+        if abs(candidate - previous_idx) < abs(closest - previous_idx):
+            closest = candidate
+    closest = max(0, min(total_notes - 1, closest))
+
+    if abs(closest - previous_idx) > 2:
+        if closest > previous_idx:
+            closest = min(previous_idx + 2, total_notes - 1)
+        else:
+            closest = max(previous_idx - 2, 0)
+    return closest
+
+
+@njit(cache=True)
+def _quantize(delta_seconds: float, beat: float) -> float:
+    if delta_seconds <= 0:
+        return 0.0
+    return np.rint(delta_seconds / beat) * beat
+
+
+@njit(cache=True)
+def build_notes(
+    lengths: np.ndarray,
+    ascii_sums: np.ndarray,
+    vowel_counts: np.ndarray,
+    alnum_counts: np.ndarray,
+    caps_counts: np.ndarray,
+    punct_counts: np.ndarray,
+    deltas: np.ndarray,
+    total_notes: int,
+    beat: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    count = lengths.shape[0]
+    starts = np.empty(count, dtype=np.float64)
+    durations = np.empty(count, dtype=np.float64)
+    pitch_indices = np.empty(count, dtype=np.int64)
+    amplitudes = np.empty(count, dtype=np.float64)
+
+    previous_idx = -1
+    previous_start = -1.0
+    for i in range(count):
+        length = lengths[i]
+
+        if alnum_counts[i] == 0:
+            base_idx = total_notes // 2
+        else:
+            base_idx = (ascii_sums[i] + vowel_counts[i] * 3) % total_notes
+        midi_idx = _smooth_pitch_index(base_idx, previous_idx, total_notes)
+
+        intensity = 0.0
+        if length > 0:
+            intensity = min((caps_counts[i] * 1.2 + punct_counts[i]) / length, 1.0)
+        amplitude = 0.28 + intensity * 0.28
+
+        raw_start = _quantize(max(deltas[i], 0.0), beat)
+        if previous_start < 0:
+            start = raw_start
+        else:
+            previous_beats = previous_start / beat
+            start_beats = max(raw_start / beat, previous_beats + 1.0)
+            if start_beats - previous_beats > 2.5:
+                start_beats = previous_beats + 2.5
+            start = start_beats * beat
+
+        if length <= 0:
+            duration = beat
+        else:
+            duration = beat * 1.1 + min(length / 95.0, 1.0) * beat * 3.0
+
+        starts[i] = start
+        durations[i] = duration
+        pitch_indices[i] = midi_idx
+        amplitudes[i] = min(amplitude, 0.9)
+        previous_idx = midi_idx
+        previous_start = start
+
+    return starts, durations, pitch_indices, amplitudes
@@ -0,0 +1,46 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def mix_layer(
+    mix: np.ndarray,
+    start: int,
+    length: int,
+    table: np.ndarray,
+    phase_step: int,
+    sample_rate: int,
+    gain: float,
+) -> None:
+    # table length must be a power of two so the phase can wrap with a mask
+    mask = table.shape[0] - 1
+    end = min(length, mix.shape[0] - start)
+    for i in range(end):
+        mix[start + i] += gain * table[(i * phase_step // sample_rate) & mask]
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def downmix_clip(audio: np.ndarray) -> np.ndarray:
+    # (frames, channels) -> mono float32 in [-1, 1], in a single pass
+    frames, channels = audio.shape
+    out = np.empty(frames, dtype=np.float32)
+    for i in prange(frames):
+        total = 0.0
+        for channel in range(channels):
+            total += audio[i, channel]
+        value = total / channels
+        if value > 1.0:
+            value = 1.0
+        elif value < -1.0:
+            value = -1.0
+        out[i] = value
+    return out
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def to_pcm16(samples: np.ndarray) -> np.ndarray:
+    out = np.empty(samples.shape[0], dtype=np.int16)
+    for i in prange(samples.shape[0]):
+        value = np.float32(min(max(samples[i], -1.0), 1.0))
+        out[i] = np.int16(value * np.float32(32767))
+    return out
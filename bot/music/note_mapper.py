@@ -1,11 +1,14 @@
 import math
 import string
-from datetime import datetime
-from typing import Iterable, List, Optional, Sequence
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, List, Sequence, Tuple
 
 import discord
+import numpy as np
 
-from .types import InstrumentWave, NoteEvent
+from ._note_kernel import build_notes
+from .types import INSTRUMENT_CODES, InstrumentWave, NoteTrack
 
 MAJOR_SCALE_STEPS: Sequence[int] = (0, 2, 4, 7, 9, 11)  
 ROOT_MIDI = 62  
@@ -14,241 +17,227 @@ SCALE_MIDI_NOTES: List[int] = [
     for octave in range(3)
     for step in MAJOR_SCALE_STEPS
 ]
+MIDI_FREQ_TABLE: Sequence[float] = tuple(440.0 * math.exp2((note - 69) / 12.0) for note in range(128))
+SCALE_FREQUENCIES: np.ndarray = np.array(MIDI_FREQ_TABLE)[SCALE_MIDI_NOTES]
+INSTRUMENT_PALETTE: Sequence[InstrumentWave] = (
+    InstrumentWave.WARM,
+    InstrumentWave.SINE,
+    InstrumentWave.BELL,
+    InstrumentWave.GLOW,
+    InstrumentWave.HARP,
+    InstrumentWave.CELESTA,
+)
+# frequency ratios for shifts of -12..+12 semitones, indexed by shift + 12
+SEMITONE_RATIOS: Sequence[float] = tuple(math.exp2(shift / 12.0) for shift in range(-12, 13))
+# (every nth note, semitone shift, amplitude scale, instrument) stacked on each melody note
+HARMONIC_LAYERS: Sequence[Tuple[int, int, float, InstrumentWave]] = (
+    (1, 4, 0.45, InstrumentWave.CELESTA),
+    (2, 7, 0.34, InstrumentWave.SINE),
+    (3, 12, 0.24, InstrumentWave.GLOW),
+)
+_PUNCT_SET = frozenset(string.punctuation)
+_VOWEL_SET = frozenset("aeiouAEIOU")
+_OTHER_CLASS, _PUNCT_CLASS, _UPPER_CLASS, _UPPER_VOWEL_CLASS, _VOWEL_CLASS, _ALNUM_CLASS = range(6)
+
+
+def _ascii_class(c: str) -> int:
+    if c in _PUNCT_SET:
+        return _PUNCT_CLASS
+    if not c.isalnum():
+        return _OTHER_CLASS
+    if c.isupper():
+        return _UPPER_VOWEL_CLASS if c in _VOWEL_SET else _UPPER_CLASS
+    return _VOWEL_CLASS if c in _VOWEL_SET else _ALNUM_CLASS
+
+
+# every ASCII byte maps to exactly one class so bincount can tally them in one pass
+ASCII_CLASS_LUT: np.ndarray = np.array([_ascii_class(chr(code)) for code in range(128)], dtype=np.uint8)
+_ASCII_DELETE = dict.fromkeys(range(128))
+# older discord.py builds lack a callable Message.is_system; check once instead of per message
+_HAS_IS_SYSTEM = callable(getattr(discord.Message, "is_system", None))
 
 
 def midi_to_frequency(midi_note: int) -> float:
-    return 440.0 * math.pow(2, (midi_note - 69) / 12)
+    return MIDI_FREQ_TABLE[midi_note]
 
 
-def _nearest_scale_frequency(target: float) -> float:
-    return min(
-        (midi_to_frequency(note) for note in SCALE_MIDI_NOTES),
-        key=lambda freq: abs(freq - target),
-    )
+def _nearest_scale_frequencies(targets: np.ndarray) -> np.ndarray:
+    # SCALE_FREQUENCIES is ascending, so only the two neighbours of the insertion point can be nearest
+    upper = np.clip(np.searchsorted(SCALE_FREQUENCIES, targets), 1, len(SCALE_FREQUENCIES) - 1)
+    lower_freq = SCALE_FREQUENCIES[upper - 1]
+    upper_freq = SCALE_FREQUENCIES[upper]
+    return np.where(targets - lower_freq <= upper_freq - targets, lower_freq, upper_freq)
 
 
-def _caps_and_punct_weight(text: str) -> float:
-    if not text:
-        return 0.0
-    caps = sum(1 for c in text if c.isupper())
-    punct = sum(1 for c in text if c in string.punctuation)
-    weighted = (caps * 1.2 + punct) / max(len(text), 1)
-    return min(weighted, 1.0)
+def _message_features(text: str) -> tuple[int, int, int, int, int, int]:
+    caps, punct, ascii_sum, vowel_count, alnum_len = _ascii_message_features(text.encode("ascii", "ignore"))
+    if not text.isascii():
+        # punctuation is ASCII-only, so the rest just needs Unicode case/alnum/lowercase checks
+        for c in text.translate(_ASCII_DELETE):
+            if c.isupper():
+                caps += 1
+            if c.isalnum():
+                alnum_len += 1
+                ascii_sum += ord(c)
+                # a few letters lowercase to ASCII vowels (U+0130 'İ' -> 'i̇')
+                vowel_count += sum(lowered in "aeiou" for lowered in c.lower())
+    return caps, punct, ascii_sum, vowel_count, alnum_len, len(text)
 
 
-def _select_instrument(author: discord.abc.User) -> InstrumentWave:
-    palette = [
-        InstrumentWave.WARM,
-        InstrumentWave.SINE,
-        InstrumentWave.BELL,
-        InstrumentWave.GLOW,
-        InstrumentWave.HARP,
-        InstrumentWave.CELESTA,
-    ]
-    author_id = getattr(author, "id", 0) or 0
-    return palette[author_id % len(palette)]
-
-
-def _content_pitch_index(content: str) -> int:
-    filtered = "".join(c for c in content if c.isalnum())
-    if not filtered:
-        return len(SCALE_MIDI_NOTES) // 2
-    ascii_sum = sum(ord(c) for c in filtered)
-    vowel_bonus = sum(1 for c in filtered.lower() if c in "aeiou") * 3
-    return (ascii_sum + vowel_bonus) % len(SCALE_MIDI_NOTES)
-
-
-def _smooth_pitch_index(base_idx: int, previous_idx: Optional[int]) -> int:
-    if previous_idx is None:
-        return base_idx
-
-    total_notes = len(SCALE_MIDI_NOTES)
-    candidates = [base_idx, base_idx + total_notes, base_idx - total_notes]
-    closest = min(candidates, key=lambda val: abs(val - previous_idx))
-    closest = max(0, min(total_notes - 1, closest))
-
-    if abs(closest - previous_idx) > 2:
-        if closest > previous_idx:
-            closest = min(previous_idx + 2, total_notes - 1)
-        else:
-            closest = max(previous_idx - 2, 0)
-    return closest
-
-
-def _quantize(delta_seconds: float, beat: float) -> float:
-    if delta_seconds <= 0:
-        return 0.0
-    beats = round(delta_seconds / beat)
-    return beats * beat
-
-
-def _note_duration(message: discord.Message, beat: float) -> float:
-    length = len(message.content.strip())
-    if length <= 0:
-        return beat
-    max_extra = beat * 3.0
-    stretch_factor = min(length / 95.0, 1.0)
-    return beat * 1.1 + stretch_factor * max_extra
-
-
-def _message_to_note(
-    message: discord.Message,
-    first_timestamp: datetime,
-    beat: float,
-    previous_idx: Optional[int],
-    previous_start: Optional[float],
-) -> tuple[NoteEvent, int, float]:
-    content = message.content.strip()
-    base_idx = _content_pitch_index(content)
-    midi_idx = _smooth_pitch_index(base_idx, previous_idx)
-    midi_note = SCALE_MIDI_NOTES[midi_idx]
-    frequency = midi_to_frequency(midi_note)
-
-    intensity = _caps_and_punct_weight(content)
-    amplitude = 0.28 + intensity * 0.28
-
-    instrument = _select_instrument(message.author)
-
-    delta = (message.created_at - first_timestamp).total_seconds()
-    raw_start = _quantize(max(delta, 0.0), beat)
-
-    if previous_start is None:
-        start = raw_start
-    else:
-        previous_beats = previous_start / beat
-        raw_beats = raw_start / beat
-        min_gap_beats = 1.0
-        max_gap_beats = 2.5
-        start_beats = max(raw_beats, previous_beats + min_gap_beats)
-        if start_beats - previous_beats > max_gap_beats:
-            start_beats = previous_beats + max_gap_beats
-        start = start_beats * beat
-
-    duration = _note_duration(message, beat)
-    note = NoteEvent(
-        start=start,
-        duration=duration,
-        frequency=frequency,
-        amplitude=min(amplitude, 0.9),
-        instrument=instrument,
-    )
+def _ascii_message_features(data: bytes) -> tuple[int, int, int, int, int]:
+    codes = np.frombuffer(data, dtype=np.uint8)
+    classes = ASCII_CLASS_LUT[codes]
+    counts = np.bincount(classes, minlength=6).tolist()
+    code_sums = np.bincount(classes, weights=codes, minlength=6)
+    caps = counts[_UPPER_CLASS] + counts[_UPPER_VOWEL_CLASS]
+    vowel_count = counts[_UPPER_VOWEL_CLASS] + counts[_VOWEL_CLASS]
+    alnum_len = caps + counts[_VOWEL_CLASS] + counts[_ALNUM_CLASS]
+    ascii_sum = int(code_sums[_UPPER_CLASS:].sum())
+    return caps, counts[_PUNCT_CLASS], ascii_sum, vowel_count, alnum_len
+
 
-    return note, midi_idx, start
+@lru_cache(maxsize=128)
+def _instrument_for_id(author_id: int) -> InstrumentWave:
+    return INSTRUMENT_PALETTE[author_id % len(INSTRUMENT_PALETTE)]
 
 
-def _harmonic_from(note: NoteEvent, semitone_shift: int, amplitude_scale: float, instrument: InstrumentWave) -> NoteEvent:
-    frequency = note.frequency * math.pow(2, semitone_shift / 12.0)
-    return NoteEvent(
-        start=note.start,
-        duration=note.duration * 1.1,
-        frequency=frequency,
-        amplitude=min(note.amplitude * amplitude_scale, 0.55),
-        instrument=instrument,
+def _select_instrument(author: discord.abc.User) -> InstrumentWave:
+    return _instrument_for_id(getattr(author, "id", 0) or 0)
+
+
+def _messages_to_notes(messages: List[discord.Message], beat: float) -> NoteTrack:
+    count = len(messages)
+    lengths = np.empty(count, dtype=np.int64)
+    ascii_sums = np.empty(count, dtype=np.int64)
+    vowel_counts = np.empty(count, dtype=np.int64)
+    alnum_counts = np.empty(count, dtype=np.int64)
+    caps_counts = np.empty(count, dtype=np.int64)
+    punct_counts = np.empty(count, dtype=np.int64)
+    deltas = np.empty(count, dtype=np.float64)
+    instruments = np.empty(count, dtype=np.int8)
+
+    first_timestamp = messages[0].created_at
+    for i, message in enumerate(messages):
+        (
+            caps_counts[i],
+            punct_counts[i],
+            ascii_sums[i],
+            vowel_counts[i],
+            alnum_counts[i],
+            lengths[i],
+        ) = _message_features(message.content.strip())
+        deltas[i] = (message.created_at - first_timestamp).total_seconds()
+        instruments[i] = INSTRUMENT_CODES[_select_instrument(message.author)]
+
+    starts, durations, pitch_indices, amplitudes = build_notes(
+        lengths,
+        ascii_sums,
+        vowel_counts,
+        alnum_counts,
+        caps_counts,
+        punct_counts,
+        deltas,
+        len(SCALE_MIDI_NOTES),
+        beat,
+    )
+    return NoteTrack(
+        starts=starts,
+        durations=durations,
+        frequencies=SCALE_FREQUENCIES[pitch_indices],
+        amplitudes=amplitudes,
+        instruments=instruments,
     )
 
 
-def _fill_gaps(notes: List[NoteEvent], beat: float) -> List[NoteEvent]:
-    if not notes:
-        return []
-    filled: List[NoteEvent] = [notes[0]]
-    for prev, curr in zip(notes, notes[1:]):
-        gap = curr.start - prev.start
-        if gap > beat * 1.4:
-            earliest = prev.start + beat * 0.35
-            latest = curr.start - beat * 0.35
-            insert_start = min(max(prev.start + gap * 0.55, earliest), latest)
-            duration = min(curr.start - insert_start, beat * 0.9)
-            duration = max(duration, beat * 0.45)
-            blended = (prev.frequency * 0.45) + (curr.frequency * 0.55)
-            frequency = _nearest_scale_frequency(blended)
-            filler = NoteEvent(
-                start=insert_start,
-                duration=duration,
-                frequency=frequency,
-                amplitude=min(max(prev.amplitude, curr.amplitude) * 0.45, 0.45),
-                instrument=InstrumentWave.GLOW,
+def _layer_harmonics(track: NoteTrack) -> NoteTrack:
+    count = len(track)
+    layers = [track]
+    slots = [np.arange(count) * (len(HARMONIC_LAYERS) + 1)]
+    for layer, (every, semitone_shift, amplitude_scale, instrument) in enumerate(HARMONIC_LAYERS, start=1):
+        idx = np.arange(0, count, every)
+        layers.append(
+            NoteTrack(
+                starts=track.starts[idx],
+                durations=track.durations[idx] * 1.1,
+                frequencies=track.frequencies[idx] * SEMITONE_RATIOS[semitone_shift + 12],
+                amplitudes=np.minimum(track.amplitudes[idx] * amplitude_scale, 0.55),
+                instruments=np.full(idx.size, INSTRUMENT_CODES[instrument], dtype=np.int8),
             )
-            filled.append(filler)
-        filled.append(curr)
-    return sorted(filled, key=lambda n: n.start)
-
-
-def _background_pad(notes: List[NoteEvent]) -> List[NoteEvent]:
-    if not notes:
-        return []
-    track_end = max(n.start + n.duration for n in notes)
-    root_note = min(notes, key=lambda n: n.frequency)
-    pad_frequency = root_note.frequency
-    pad_duration = track_end + 1.5
-    pad = NoteEvent(
-        start=0.0,
-        duration=pad_duration,
-        frequency=pad_frequency,
-        amplitude=0.16,
-        instrument=InstrumentWave.WARM,
-    )
-    shimmer = NoteEvent(
-        start=0.0,
-        duration=pad_duration,
-        frequency=pad_frequency * math.pow(2, 12 / 12.0),
-        amplitude=pad.amplitude * 0.45,
-        instrument=InstrumentWave.CELESTA,
+        )
+        slots.append(idx * (len(HARMONIC_LAYERS) + 1) + layer)
+    # keep each note directly followed by its own harmonics
+    return NoteTrack.concatenate(layers).take(np.argsort(np.concatenate(slots)))
+
+
+def _fill_gaps(track: NoteTrack, beat: float) -> NoteTrack:
+    starts = track.starts
+    frequencies = track.frequencies
+    amplitudes = track.amplitudes
+
+    gaps = np.diff(starts)
+    gap_idx = np.flatnonzero(gaps > beat * 1.4)
+    prev_start = starts[gap_idx]
+    curr_start = starts[gap_idx + 1]
+    earliest = prev_start + beat * 0.35
+    latest = curr_start - beat * 0.35
+    insert_start = np.minimum(np.maximum(prev_start + gaps[gap_idx] * 0.55, earliest), latest)
+    blended = frequencies[gap_idx] * 0.45 + frequencies[gap_idx + 1] * 0.55
+    fillers = NoteTrack(
+        starts=insert_start,
+        durations=np.maximum(np.minimum(curr_start - insert_start, beat * 0.9), beat * 0.45),
+        frequencies=_nearest_scale_frequencies(blended),
+        amplitudes=np.minimum(np.maximum(amplitudes[gap_idx], amplitudes[gap_idx + 1]) * 0.45, 0.45),
+        instruments=np.full(gap_idx.size, INSTRUMENT_CODES[InstrumentWave.GLOW], dtype=np.int8),
     )
-    choir = NoteEvent(
-        start=0.0,
-        duration=pad_duration,
-        frequency=pad_frequency * math.pow(2, -12 / 12.0),
-        amplitude=pad.amplitude * 0.4,
-        instrument=InstrumentWave.CHOIR,
+    # each filler sits just before the note that closes its gap; lexsort keeps that order on ties
+    positions = np.concatenate((np.arange(len(track), dtype=np.float64), gap_idx + 0.5))
+    order = np.lexsort((positions, np.concatenate((starts, insert_start))))
+    return NoteTrack.concatenate((track, fillers)).take(order)
+
+
+def _background_pad(track: NoteTrack) -> NoteTrack:
+    pad_duration = float((track.starts + track.durations).max()) + 1.5
+    pad_frequency = float(track.frequencies.min())
+    pad_amplitude = 0.16
+    return NoteTrack(
+        starts=np.zeros(3, dtype=np.float64),
+        durations=np.full(3, pad_duration, dtype=np.float64),
+        frequencies=np.array([pad_frequency, pad_frequency * 2.0, pad_frequency * 0.5]),
+        amplitudes=np.array([pad_amplitude, pad_amplitude * 0.45, pad_amplitude * 0.4]),
+        instruments=np.array(
+            [
+                INSTRUMENT_CODES[InstrumentWave.WARM],
+                INSTRUMENT_CODES[InstrumentWave.CELESTA],
+                INSTRUMENT_CODES[InstrumentWave.CHOIR],
+            ],
+            dtype=np.int8,
+        ),
     )
-    return [pad, shimmer, choir]
-
-
-def notes_from_messages(messages: Iterable[discord.Message], beat: float = 0.55) -> List[NoteEvent]:
-    filtered: List[discord.Message] = []
-    for msg in messages:
-        if not msg.content:
-            continue
-        if getattr(msg.author, "bot", False):
-            continue
-        if msg.webhook_id:
-            continue
-        is_system = False
-        try:
-            is_system = msg.is_system()
-        except TypeError:
-            is_system = False
-        if is_system:
-            continue
-        filtered.append(msg)
+
+
+def warm_up_note_kernel() -> None:
+    # compiles (or loads the cached) Numba kernel so the first composition does not pay for it
+    counts = np.zeros(1, dtype=np.int64)
+    build_notes(counts, counts, counts, counts, counts, counts, np.zeros(1), len(SCALE_MIDI_NOTES), 0.55)
+
+
+def is_playable_message(msg: discord.Message) -> bool:
+    if not msg.content:
+        return False
+    if getattr(msg.author, "bot", False):
+        return False
+    if msg.webhook_id:
+        return False
+    return not (_HAS_IS_SYSTEM and msg.is_system())
+
+
+def notes_from_messages(messages: Iterable[discord.Message], beat: float = 0.55) -> NoteTrack:
+    filtered = [msg for msg in messages if is_playable_message(msg)]
     if not filtered:
-        return []
-
-    filtered.sort(key=lambda m: m.created_at)
-    first_timestamp = filtered[0].created_at
-
-    events: List[NoteEvent] = []
-    previous_idx: Optional[int] = None
-    previous_start: Optional[float] = None
-    for message in filtered:
-        note, previous_idx, previous_start = _message_to_note(
-            message,
-            first_timestamp,
-            beat,
-            previous_idx,
-            previous_start,
-        )
-        events.append(note)
-
-    layered: List[NoteEvent] = []
-    for idx, note in enumerate(events):
-        layered.append(note)
-        layered.append(_harmonic_from(note, 4, 0.45, InstrumentWave.CELESTA))
-        if idx % 2 == 0:
-            layered.append(_harmonic_from(note, 7, 0.34, InstrumentWave.SINE))
-        if idx % 3 == 0:
-            layered.append(_harmonic_from(note, 12, 0.24, InstrumentWave.GLOW))
-
-    layered = _fill_gaps(layered, beat)
-    layered.extend(_background_pad(layered))
-    return layered
+        return NoteTrack.empty()
+
+    # callers normally pass chronological history, which timsort verifies in one pass
+    filtered.sort(key=attrgetter("created_at"))
+    track = _layer_harmonics(_messages_to_notes(filtered, beat))
+    track = _fill_gaps(track, beat)
+    return NoteTrack.concatenate((track, _background_pad(track)))
@@ -2,48 +2,158 @@ import io
 import logging
 import math
 import os
-from typing import Dict, Iterable, Tuple
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache, partial
+from types import ModuleType
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
-from pydub import AudioSegment
-from pydub.generators import Sawtooth, Sine, Square, Triangle
+import numpy as np
 
-from .types import InstrumentWave, NoteEvent
+# scipy.signal and the Numba synth kernels are imported where they are used: only the
+# render worker needs them, and they would otherwise add ~0.7 s to the bot's startup
+from .types import INSTRUMENTS, InstrumentWave, NoteEvent, NoteTrack
 
-try:  # optional real-instrument rendering
-    import numpy as np
-    import pretty_midi
+_LOG = logging.getLogger("symphcord.synthesis")
+_SOUNDFONT_PATH = os.getenv("SOUNDFONT_PATH")
+
+
+def _render_threads() -> int:
+    default = os.cpu_count() or 1
+    raw = os.getenv("SYMPHCORD_THREADS")
+    if not raw:
+        return default
+    try:
+        threads = int(raw)
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        _LOG.warning("Ignoring invalid SYMPHCORD_THREADS=%r; using %d render threads.", raw, default)
+        return default
+    return threads
+
+
+_RENDER_THREADS = _render_threads()
+
+
+@lru_cache(maxsize=1)
+def _pretty_midi() -> Optional[ModuleType]:
+    # optional real-instrument rendering; pretty_midi is slow to import, so load it on first use
+    try:
+        import pretty_midi
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
     try:
         import fluidsynth  # noqa: F401  # ensure pyfluidsynth is present
     except ImportError:  # pragma: no cover - optional dependency
-        fluidsynth = None  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency
-    np = None  # type: ignore
-    pretty_midi = None  # type: ignore
-    fluidsynth = None  # type: ignore
+        _LOG.warning(
+            "SOUNDFONT_PATH provided but pyfluidsynth is missing; install it with 'pip install pyfluidsynth'."
+        )
+        return None
+    return pretty_midi
 
 
-_LOG = logging.getLogger("symphcord.synthesis")
-_SOUNDFONT_PATH = os.getenv("SOUNDFONT_PATH")
+def _sine(phase: np.ndarray) -> np.ndarray:
+    return np.sin(2 * np.pi * phase)
+
+
+def _square(phase: np.ndarray) -> np.ndarray:
+    return np.where(phase % 1.0 < 0.5, 1.0, -1.0)
+
+
+def _sawtooth(phase: np.ndarray) -> np.ndarray:
+    return 2.0 * (phase % 1.0) - 1.0
+
 
-if _SOUNDFONT_PATH and pretty_midi and np is not None and fluidsynth is None:
-    _LOG.warning(
-        "SOUNDFONT_PATH provided but pyfluidsynth is missing; install it with 'pip install pyfluidsynth'."
-    )
-
-GENERATOR_MAP = {
-    InstrumentWave.SINE: Sine,
-    InstrumentWave.SQUARE: Square,
-    InstrumentWave.SAWTOOTH: Sawtooth,
-    InstrumentWave.TRIANGLE: Triangle,
-    InstrumentWave.WARM: Sine,
-    InstrumentWave.BELL: Sine,
-    InstrumentWave.PULSE: Triangle,
-    InstrumentWave.GLOW: Triangle,
-    InstrumentWave.HARP: Sine,
-    InstrumentWave.CELESTA: Sine,
-    InstrumentWave.CHOIR: Sine,
+def _triangle(phase: np.ndarray) -> np.ndarray:
+    return 1.0 - 4.0 * np.abs(phase % 1.0 - 0.5)
+
+
+# single-period wavetables; mix_layer needs a power-of-two size to wrap the phase with a mask
+_TABLE_SIZE = 2048
+
+
+def _wavetable(waveform: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    return waveform(np.arange(_TABLE_SIZE) / _TABLE_SIZE).astype(np.float32)
+
+
+_SINE_TABLE = _wavetable(_sine)
+_SQUARE_TABLE = _wavetable(_square)
+_SAWTOOTH_TABLE = _wavetable(_sawtooth)
+_TRIANGLE_TABLE = _wavetable(_triangle)
+
+GENERATOR_MAP: Dict[InstrumentWave, np.ndarray] = {
+    InstrumentWave.SINE: _SINE_TABLE,
+    InstrumentWave.SQUARE: _SQUARE_TABLE,
+    InstrumentWave.SAWTOOTH: _SAWTOOTH_TABLE,
+    InstrumentWave.TRIANGLE: _TRIANGLE_TABLE,
+    InstrumentWave.WARM: _SINE_TABLE,
+    InstrumentWave.BELL: _SINE_TABLE,
+    InstrumentWave.PULSE: _TRIANGLE_TABLE,
+    InstrumentWave.GLOW: _TRIANGLE_TABLE,
+    InstrumentWave.HARP: _SINE_TABLE,
+    InstrumentWave.CELESTA: _SINE_TABLE,
+    InstrumentWave.CHOIR: _SINE_TABLE,
+}
+
+
+def _db_to_gain(gain_db: float) -> float:
+    return 10 ** (gain_db / 20)
+
+
+# extra oscillators per instrument: (table, frequency multiplier, lowest frequency in Hz, linear gain)
+_INSTRUMENT_LAYERS: Dict[InstrumentWave, Tuple[Tuple[np.ndarray, float, float, float], ...]] = {
+    InstrumentWave.WARM: (
+        (_SINE_TABLE, 0.5, 55.0, _db_to_gain(-12.0)),
+        (_TRIANGLE_TABLE, 2.0, 0.0, _db_to_gain(-15.0)),
+    ),
+    InstrumentWave.BELL: (
+        (_SINE_TABLE, 2.5, 0.0, _db_to_gain(-8.0)),
+        (_TRIANGLE_TABLE, 3.5, 0.0, _db_to_gain(-14.0)),
+    ),
+    InstrumentWave.PULSE: (
+        (_TRIANGLE_TABLE, 2.0, 0.0, _db_to_gain(-10.0)),
+        (_SINE_TABLE, 0.5, 40.0, _db_to_gain(-14.0)),
+    ),
+    InstrumentWave.GLOW: (
+        (_SINE_TABLE, 0.4, 30.0, _db_to_gain(-18.0)),
+        (_TRIANGLE_TABLE, 1.6, 0.0, _db_to_gain(-14.0)),
+    ),
+    InstrumentWave.HARP: (
+        (_TRIANGLE_TABLE, 1.0, 0.0, _db_to_gain(-8.0)),
+        (_SINE_TABLE, 2.0, 0.0, _db_to_gain(-12.0)),
+    ),
+    InstrumentWave.CELESTA: (
+        (_SINE_TABLE, 2.8, 0.0, _db_to_gain(-6.0)),
+        (_TRIANGLE_TABLE, 4.2, 0.0, _db_to_gain(-15.0)),
+    ),
+    InstrumentWave.CHOIR: (
+        (_SINE_TABLE, 0.5, 0.0, _db_to_gain(-12.0)),
+        (_SQUARE_TABLE, 1.0, 0.0, _db_to_gain(-18.0)),
+    ),
+}
+
+# (min attack ms, attack share of duration, min release ms, release share of duration)
+_DEFAULT_ENVELOPE: Tuple[int, float, int, float] = (15, 0.18, 60, 0.35)
+_ENVELOPES: Dict[InstrumentWave, Tuple[int, float, int, float]] = {
+    InstrumentWave.HARP: (5, 0.05, 80, 0.4),
+    InstrumentWave.CELESTA: (6, 0.08, 70, 0.3),
+    InstrumentWave.CHOIR: (25, 0.25, 120, 0.45),
 }
 
+_MAX_CACHED_NOTE_MS = 2000
+
+# (delay ms, linear gain): a 90 ms slap delay plus three reflections that sit under a -6 dB wet bus
+_REVERB_WET_GAIN = _db_to_gain(-6.0)
+_REVERB_TAPS: Tuple[Tuple[int, float], ...] = ((90, _db_to_gain(-9.0)),) + tuple(
+    (delay_ms, _REVERB_WET_GAIN * _db_to_gain(gain_db))
+    for delay_ms, gain_db in ((110, -12.0), (260, -17.0), (430, -22.0))
+)
+
+# log-midpoints between piano keys 21..108; searching them rounds a frequency to its nearest key
+_MIDI_KEY_BOUNDARIES = 440.0 * np.exp2((np.arange(21, 108) + 0.5 - 69) / 12)
+
 MIDI_PROGRAMS: Dict[InstrumentWave, int] = {
     InstrumentWave.SINE: 0,  # Acoustic Grand Piano
     InstrumentWave.WARM: 88,  # Pad 1 (New Age)
@@ -58,185 +168,153 @@ MIDI_PROGRAMS: Dict[InstrumentWave, int] = {
     InstrumentWave.TRIANGLE: 0,
 }
 
+_PROGRAM_BY_CODE = np.array([MIDI_PROGRAMS.get(instrument, 0) for instrument in INSTRUMENTS], dtype=np.int16)
+
+
+@lru_cache(maxsize=8)
+def _soft_filter_sos(sample_rate: int) -> np.ndarray:
+    from scipy import signal
+
+    low_pass = signal.butter(4, 6400, "lowpass", fs=sample_rate, output="sos")
+    high_pass = signal.butter(2, 120, "highpass", fs=sample_rate, output="sos")
+    return np.vstack((low_pass, high_pass))
+
+
+def _soft_filter(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    from scipy import signal
 
-def _soft_filter(segment: AudioSegment) -> AudioSegment:
     # trim sharp highs and low rumbles to keep the tone gentle
-    filtered = segment.low_pass_filter(6400).high_pass_filter(120)
-    return filtered
-
-
-def _apply_reverb(segment: AudioSegment) -> AudioSegment:
-    reflections = [110, 260, 430]
-    mix = AudioSegment.silent(
-        duration=len(segment) + reflections[-1],
-        frame_rate=segment.frame_rate,
-    ).overlay(segment, position=0)
-    for idx, delay in enumerate(reflections):
-        decay = segment.apply_gain(-12 - idx * 5)
-        mix = mix.overlay(decay, position=delay)
-    return mix
-
-
-def _build_segment(note: NoteEvent, duration_ms: int, sample_rate: int) -> AudioSegment:
-    amplitude = max(0.1, min(note.amplitude, 0.85))
-    generator_cls = GENERATOR_MAP.get(note.instrument, Sine)
-    layers: list[AudioSegment] = [
-        generator_cls(
-            note.frequency,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms)
-    ]
-    attack = max(15, int(duration_ms * 0.18))
-    release = max(60, int(duration_ms * 0.35))
-
-    if note.instrument == InstrumentWave.WARM:
-        lower = Sine(
-            max(note.frequency / 2, 55.0),
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-12.0)
-        shimmer = Triangle(
-            note.frequency * 2,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-15.0)
-        layers.extend([lower, shimmer])
-    elif note.instrument == InstrumentWave.BELL:
-        overtone = Sine(
-            note.frequency * 2.5,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-8.0)
-        chime = Triangle(
-            note.frequency * 3.5,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-14.0)
-        layers.extend([overtone, chime])
-    elif note.instrument == InstrumentWave.PULSE:
-        accent = Triangle(
-            note.frequency * 2,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-10.0)
-        sub = Sine(
-            max(note.frequency / 2, 40.0),
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-14.0)
-        layers.extend([accent, sub])
-    elif note.instrument == InstrumentWave.GLOW:
-        breath = Sine(
-            max(note.frequency / 2.5, 30.0),
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-18.0)
-        shimmer = Triangle(
-            note.frequency * 1.6,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-14.0)
-        layers.extend([breath, shimmer])
-    elif note.instrument == InstrumentWave.HARP:
-        accent = Triangle(
-            note.frequency,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-8.0)
-        ping = Sine(
-            note.frequency * 2,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-12.0)
-        layers.extend([accent, ping])
-        attack = max(5, int(duration_ms * 0.05))
-        release = max(80, int(duration_ms * 0.4))
-    elif note.instrument == InstrumentWave.CELESTA:
-        chime = Sine(
-            note.frequency * 2.8,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-6.0)
-        tinkle = Triangle(
-            note.frequency * 4.2,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-15.0)
-        layers.extend([chime, tinkle])
-        attack = max(6, int(duration_ms * 0.08))
-        release = max(70, int(duration_ms * 0.3))
-    elif note.instrument == InstrumentWave.CHOIR:
-        airy = Sine(
-            note.frequency * 0.5,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-12.0)
-        vowel = Square(
-            note.frequency,
-            sample_rate=sample_rate,
-            bit_depth=16,
-        ).to_audio_segment(duration=duration_ms).apply_gain(-18.0)
-        layers.extend([airy, vowel])
-        attack = max(25, int(duration_ms * 0.25))
-        release = max(120, int(duration_ms * 0.45))
-
-    segment = layers[0]
-    for layer in layers[1:]:
-        segment = segment.overlay(layer)
-
-    gain_db = 20 * math.log10(amplitude)
-    segment = segment.apply_gain(gain_db).fade_in(attack).fade_out(release)
-    segment = _soft_filter(segment)
-    return _add_air(segment)
-
-
-def _add_air(segment: AudioSegment) -> AudioSegment:
-    reverb = _apply_reverb(segment)
-    shimmer = reverb.high_pass_filter(1800).apply_gain(-12)
-    delay = segment.overlay(segment.apply_gain(-9), position=90)
-    blended = segment.overlay(reverb.apply_gain(-6))
-    blended = blended.overlay(shimmer)
-    blended = blended.overlay(delay)
+    return signal.sosfilt(_soft_filter_sos(sample_rate), samples).astype(np.float32)
+
+
+def _envelope_ramps(attack: int, release: int) -> Tuple[np.ndarray, np.ndarray]:
+    fade_in = np.linspace(0.0, 1.0, attack, dtype=np.float32)
+    fade_out = np.linspace(1.0, 0.0, release, dtype=np.float32)
+    fade_in.flags.writeable = False
+    fade_out.flags.writeable = False
+    return fade_in, fade_out
+
+
+_cached_envelope_ramps = lru_cache(maxsize=64)(_envelope_ramps)
+
+
+def _note_wave(instrument: InstrumentWave, frequency: float, duration_ms: int, sample_rate: int) -> np.ndarray:
+    from ._synth_kernel import mix_layer
+
+    n_samples = duration_ms * sample_rate // 1000
+    samples = np.zeros(n_samples, dtype=np.float32)
+    attack_ms, attack_share, release_ms, release_share = _ENVELOPES.get(instrument, _DEFAULT_ENVELOPE)
+    attack = max(attack_ms, int(duration_ms * attack_share)) * sample_rate // 1000
+    release = max(release_ms, int(duration_ms * release_share)) * sample_rate // 1000
+
+    layers = ((GENERATOR_MAP.get(instrument, _SINE_TABLE), 1.0, 0.0, 1.0),)
+    layers += _INSTRUMENT_LAYERS.get(instrument, ())
+    for table, multiplier, floor_hz, gain in layers:
+        mix_layer(
+            samples,
+            0,
+            n_samples,
+            table,
+            int(max(frequency * multiplier, floor_hz) * _TABLE_SIZE),
+            sample_rate,
+            gain,
+        )
+    ramps = _cached_envelope_ramps if duration_ms <= _MAX_CACHED_NOTE_MS else _envelope_ramps
+    fade_in, fade_out = ramps(attack, release)
+    # linear fade in/out; where the ramps overlap on short notes they multiply
+    samples[:attack] *= fade_in[:n_samples]
+    samples[max(n_samples - release, 0) :] *= fade_out[max(release - n_samples, 0) :]
+    # may be shared between every note with the same key, so callers must not mutate it
+    samples.flags.writeable = False
+    return samples
+
+
+_cached_note_wave = lru_cache(maxsize=128)(_note_wave)
+
+
+def _render_note(instrument: int, frequency: float, duration: float, sample_rate: int) -> np.ndarray:
+    # repeated pitches and lengths are common, so notes are cached at 0.01 Hz / 10 ms resolution;
+    # long notes (mostly the one-off background pad) bypass the cache so it stays a few tens of MB
+    duration_ms = round(max(int(duration * 1000), 80), -1)
+    render = _cached_note_wave if duration_ms <= _MAX_CACHED_NOTE_MS else _note_wave
+    return render(INSTRUMENTS[instrument], round(frequency, 2), duration_ms, sample_rate)
+
+
+def _to_wav(samples: np.ndarray, sample_rate: int) -> io.BytesIO:
+    from ._synth_kernel import to_pcm16
+
+    pcm = to_pcm16(samples)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(pcm.tobytes())
+    buffer.seek(0)
+    return buffer
+
+
+def _add_air(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    blended = samples * np.float32(2.0 + _REVERB_WET_GAIN)
+    for delay_ms, gain in _REVERB_TAPS:
+        offset = delay_ms * sample_rate // 1000
+        if offset < len(samples):
+            blended[offset:] += np.float32(gain) * samples[: len(samples) - offset]
     return blended
 
 
+def _master(samples: np.ndarray, sample_rate: int) -> io.BytesIO:
+    samples = _soft_filter(samples, sample_rate)
+    peak = float(np.abs(samples).max()) if samples.size else 0.0
+    if peak > 0:
+        samples *= np.float32(10 ** (-1 / 20) / peak)  # normalise the peak to -1 dBFS
+    return _to_wav(samples, sample_rate)
+
+
+def _frequencies_to_midi(freqs: np.ndarray) -> np.ndarray:
+    keys = 21 + np.searchsorted(_MIDI_KEY_BOUNDARIES, freqs)
+    return np.where(freqs > 0, keys, 60).astype(np.int32)
+
+
 def _frequency_to_midi(freq: float) -> int:
-    if freq <= 0:
-        return 60
-    midi = 69 + 12 * math.log2(freq / 440.0)
-    return int(max(21, min(108, round(midi))))
+    return int(_frequencies_to_midi(np.array([freq]))[0])
 
 
 def _render_with_soundfont(
-    events: Iterable[NoteEvent],
+    track: NoteTrack,
     total_duration: float,
     sample_rate: int,
 ) -> Tuple[io.BytesIO, float]:
-    if pretty_midi is None or np is None or not _SOUNDFONT_PATH or fluidsynth is None:
+    from ._synth_kernel import downmix_clip
+
+    pretty_midi = _pretty_midi() if _SOUNDFONT_PATH else None
+    if pretty_midi is None:
         raise RuntimeError("SoundFont rendering is not available.")
 
     pm = pretty_midi.PrettyMIDI(resolution=960)
-    instrument_tracks: Dict[int, pretty_midi.Instrument] = {}
-
-    for event in events:
-        program = MIDI_PROGRAMS.get(event.instrument, 0)
-        track = instrument_tracks.get(program)
-        if track is None:
-            track = pretty_midi.Instrument(program=program)
-            instrument_tracks[program] = track
-            pm.instruments.append(track)
-
-        velocity = int(max(32, min(118, event.amplitude * 127)))
-        note_number = _frequency_to_midi(event.frequency)
-        note = pretty_midi.Note(
-            velocity=velocity,
-            pitch=note_number,
-            start=max(event.start, 0.0),
-            end=max(event.start + event.duration, event.start + 0.15),
+
+    programs = _PROGRAM_BY_CODE[track.instruments]
+    velocities = np.clip((track.amplitudes * 127).astype(np.int32), 32, 118)
+    pitches = _frequencies_to_midi(track.frequencies)
+    starts = np.maximum(track.starts, 0.0)
+    ends = np.maximum(track.starts + track.durations, track.starts + 0.15)
+
+    # one pretty_midi track per program, in order of first appearance
+    unique_programs, first_seen = np.unique(programs, return_index=True)
+    for program in unique_programs[np.argsort(first_seen)].tolist():
+        idx = np.flatnonzero(programs == program)
+        instrument = pretty_midi.Instrument(program=program)
+        instrument.notes.extend(
+            pretty_midi.Note(velocity=velocity, pitch=pitch, start=start, end=end)
+            for velocity, pitch, start, end in zip(
+                velocities[idx].tolist(),
+                pitches[idx].tolist(),
+                starts[idx].tolist(),
+                ends[idx].tolist(),
+            )
         )
-        track.notes.append(note)
-# hi 
+        pm.instruments.append(instrument)
+
     if not pm.instruments:
         raise RuntimeError("No instruments to render via SoundFont.")
 
@@ -244,61 +322,32 @@ def _render_with_soundfont(
         audio = pm.fluidsynth(fs=sample_rate, sf2_path=_SOUNDFONT_PATH)
     except TypeError:  # pretty_midi versions <0.2.10
         audio = pm.fluidsynth(sample_rate, _SOUNDFONT_PATH)
-    if audio.ndim > 1:
-        audio = audio.mean(axis=1)
-
-    audio = np.clip(audio, -1.0, 1.0)
-    samples = (audio * 32767).astype(np.int16)
-    segment = AudioSegment(
-        samples.tobytes(),
-        frame_rate=sample_rate,
-        sample_width=2,
-        channels=1,
-    )
-    segment = _soft_filter(segment)
-    segment = _add_air(segment)
-
-    buffer = io.BytesIO()
-    segment.export(buffer, format="wav")
-    buffer.seek(0)
-    return buffer, total_duration
+    if audio.ndim == 1:
+        audio = audio[:, np.newaxis]
+    audio = downmix_clip(audio)
+    return _master(_add_air(audio, sample_rate), sample_rate), total_duration
 
 
 def _scale_events(
     events: Iterable[NoteEvent],
     min_duration: float,
     max_duration: float,
-) -> Tuple[list[NoteEvent], float]:
-    event_list = list(events)
-    if not event_list:
-        return [], 0.0
+) -> Tuple[NoteTrack, float]:
+    track = events if isinstance(events, NoteTrack) else NoteTrack.from_events(events)
+    if not len(track):
+        return track, 0.0
 
-    base_length = max(note.start + note.duration for note in event_list)
+    base_length = float((track.starts + track.durations).max())
     if base_length <= 0:
         base_length = min_duration
 
     target = max(min_duration, min(base_length, max_duration))
-    if base_length < min_duration or base_length > max_duration:
-        target = max(min_duration, min(max_duration, base_length))
-
-    if base_length == 0:
-        scale = 1.0
-    else:
-        scale = target / base_length
-
-    scaled_events = [
-        NoteEvent(
-            start=note.start * scale,
-            duration=note.duration * scale,
-            frequency=note.frequency,
-            amplitude=note.amplitude,
-            instrument=note.instrument,
-        )
-        for note in event_list
-    ]
+    scale = target / base_length if base_length else 1.0
+    if scale == 1.0:
+        return track, base_length
 
-    final_length = max(note.start + note.duration for note in scaled_events)
-    return scaled_events, final_length
+    scaled = replace(track, starts=track.starts * scale, durations=track.durations * scale)
+    return scaled, base_length * scale
 
 
 def render_notes_to_wav(
@@ -307,35 +356,34 @@ def render_notes_to_wav(
     max_duration: float = 30.0,
     sample_rate: int = 44100,
 ) -> tuple[io.BytesIO, float]:
-    scaled_events, total_duration = _scale_events(events, min_duration, max_duration)
-    if not scaled_events:
+    track, total_duration = _scale_events(events, min_duration, max_duration)
+    if not len(track):
         raise ValueError("No events to render.")
 
-    if _SOUNDFONT_PATH and pretty_midi and np is not None:
+    if _SOUNDFONT_PATH and _pretty_midi() is not None:
         try:
-            return _render_with_soundfont(scaled_events, total_duration, sample_rate)
+            return _render_with_soundfont(track, total_duration, sample_rate)
         except Exception as exc:  # pragma: no cover - optional path
             _LOG.warning("SoundFont rendering failed (%s); falling back to synth", exc)
 
     tail = 1.0
-    track_length = int(math.ceil((total_duration + tail) * 1000))
-    output = AudioSegment.silent(duration=track_length, frame_rate=sample_rate)
-
-    for note in scaled_events:
-        duration_ms = max(int(note.duration * 1000), 80)
-        segment = _build_segment(note, duration_ms, sample_rate)
-        start_ms = int(note.start * 1000)
-        output = output.overlay(segment, position=start_ms)
-
-    peak_level = output.max_dBFS
-    if math.isfinite(peak_level):
-        target_level = -1.0
-        if peak_level > target_level:
-            output = output.apply_gain(target_level - peak_level)
-    else:
-        output = output.apply_gain(-3.0)
+    total_samples = int(math.ceil((total_duration + tail) * sample_rate))
+    mix = np.zeros(total_samples, dtype=np.float32)
+
+    starts = (track.starts * 1000).astype(np.int64) * sample_rate // 1000
+    in_range = starts < total_samples
+    audible = track.take(in_range)
+    gains = np.clip(audible.amplitudes, 0.1, 0.85).tolist()
+    # mix_layer releases the GIL, so notes render in parallel; summing stays on this thread
+    with ThreadPoolExecutor(max_workers=_RENDER_THREADS) as pool:
+        rendered = pool.map(
+            partial(_render_note, sample_rate=sample_rate),
+            audible.instruments.tolist(),
+            audible.frequencies.tolist(),
+            audible.durations.tolist(),
+        )
+        for start, gain, samples in zip(starts[in_range].tolist(), gains, rendered):
+            end = min(start + len(samples), total_samples)
+            mix[start:end] += np.float32(gain) * samples[: end - start]
 
-    buffer = io.BytesIO()
-    output.export(buffer, format="wav")
-    buffer.seek(0)
-    return buffer, total_duration
+    return _master(_add_air(mix, sample_rate), sample_rate), total_duration
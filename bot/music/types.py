@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
 
 
 class InstrumentWave(Enum):
@@ -16,6 +19,11 @@ class InstrumentWave(Enum):
     CHOIR = "choir"
 
 
+# NoteTrack stores instruments as int8 indices into this tuple
+INSTRUMENTS: Tuple[InstrumentWave, ...] = tuple(InstrumentWave)
+INSTRUMENT_CODES: Dict[InstrumentWave, int] = {instrument: code for code, instrument in enumerate(INSTRUMENTS)}
+
+
 @dataclass
 class NoteEvent:
     start: float  # seconds
@@ -23,3 +31,72 @@ class NoteEvent:
     frequency: float  # Hz
     amplitude: float  # 0..1
     instrument: InstrumentWave
+
+
+@dataclass(eq=False)  # generated __eq__ would compare ndarrays as truth values
+class NoteTrack:
+    """Column-wise batch of notes; iterating it yields NoteEvent views."""
+
+    starts: np.ndarray  # seconds, float64
+    durations: np.ndarray  # seconds, float64
+    frequencies: np.ndarray  # Hz, float64
+    amplitudes: np.ndarray  # 0..1, float64
+    instruments: np.ndarray  # int8 codes into INSTRUMENTS
+
+    @classmethod
+    def empty(cls) -> "NoteTrack":
+        return cls(*(np.empty(0, dtype=np.float64) for _ in range(4)), np.empty(0, dtype=np.int8))
+
+    @classmethod
+    def from_events(cls, events: Iterable[NoteEvent]) -> "NoteTrack":
+        events = list(events)
+        count = len(events)
+        return cls(
+            starts=np.fromiter((e.start for e in events), dtype=np.float64, count=count),
+            durations=np.fromiter((e.duration for e in events), dtype=np.float64, count=count),
+            frequencies=np.fromiter((e.frequency for e in events), dtype=np.float64, count=count),
+            amplitudes=np.fromiter((e.amplitude for e in events), dtype=np.float64, count=count),
+            instruments=np.fromiter((INSTRUMENT_CODES[e.instrument] for e in events), dtype=np.int8, count=count),
+        )
+
+    @classmethod
+    def concatenate(cls, tracks: Iterable["NoteTrack"]) -> "NoteTrack":
+        tracks = list(tracks)
+        return cls(
+            starts=np.concatenate([t.starts for t in tracks]),
+            durations=np.concatenate([t.durations for t in tracks]),
+            frequencies=np.concatenate([t.frequencies for t in tracks]),
+            amplitudes=np.concatenate([t.amplitudes for t in tracks]),
+            instruments=np.concatenate([t.instruments for t in tracks]),
+        )
+
+    def take(self, indices: np.ndarray) -> "NoteTrack":
+        return NoteTrack(
+            starts=self.starts[indices],
+            durations=self.durations[indices],
+            frequencies=self.frequencies[indices],
+            amplitudes=self.amplitudes[indices],
+            instruments=self.instruments[indices],
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[NoteEvent]:
+        for start, duration, frequency, amplitude, code in zip(
+            self.starts.tolist(),
+            self.durations.tolist(),
+            self.frequencies.tolist(),
+            self.amplitudes.tolist(),
+            self.instruments.tolist(),
+        ):
+            yield NoteEvent(
+                start=start,
+                duration=duration,
+                frequency=frequency,
+                amplitude=amplitude,
+                instrument=INSTRUMENTS[code],
+            )
+
+    def to_events(self) -> List[NoteEvent]:
+        return list(self)
@@ -0,0 +1,9 @@
+import logging
+import os
+
+
+def configure_logging() -> None:
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format="[%(asctime)s] %(levelname)s:%(name)s: %(message)s",
+    )
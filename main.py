@@ -4,13 +4,7 @@ import os
 from dotenv import load_dotenv
 
 from bot import SymphCordBot
-
-
-def configure_logging() -> None:
-    logging.basicConfig(
-        level=os.getenv("LOG_LEVEL", "INFO"),
-        format="[%(asctime)s] %(levelname)s:%(name)s: %(message)s",
-    )
+from bot.utils.log import configure_logging
 
 
 def main() -> None: